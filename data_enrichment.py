@@ -1,137 +1,235 @@
+import os
 import pandas as pd
-import requests
-from datetime import datetime
 import json
 
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Column types for the album club CSV; skips pandas' per-column type inference.
+# Year is left out so a blank or non-numeric entry is coerced rather than raising
+CSV_DTYPES = {
+    'Month': 'string',
+    'album_name': 'string',
+    'album_artist': 'string',
+    'Genre': 'category',
+    'Genera': 'category',
+    'select_member': 'category',
+    'score': 'float64',
+    'Blurb': 'string'
+}
+
+# Columns consumed downstream; anything else in the sheet is skipped at parse time
+CSV_COLUMNS = frozenset([
+    'Month', 'Year', 'album_name', 'album_artist', 'album_release_date',
+    'select_member', 'Genre', 'Genera', 'score', 'Blurb'
+])
+
+# Suggested new columns for the collection template, with the example values
+# filled into its first row
+SAMPLE_ROW = {
+    'album_length_minutes': '45',
+    'track_count': '12',
+    'avg_member_rating': '7.5',
+    'discussion_attendance_count': '4',
+    'standout_tracks': 'Track 3, Track 7',
+    'discussion_themes': 'production, nostalgia',
+    'new_discovery_for_most': 'Yes',
+    'selector_familiarity': 'Heard before',
+    'would_recommend': 'Yes'
+}
+
+# Suggested data points, grouped by how they would be collected
+_SUGGESTIONS = {
+    "easy_manual_additions": {
+        "album_length_minutes": {
+            "description": "Total runtime of each album",
+            "value": "Quick to find on Spotify/Apple Music",
+            "insight": "Analyze listening commitment, find sweet spot lengths"
+        },
+        "track_count": {
+            "description": "Number of tracks per album",
+            "value": "Easy to count",
+            "insight": "Compare EP vs LP preferences"
+        },
+        "member_rating": {
+            "description": "1-10 rating from each member who listened",
+            "value": "Quick post-discussion survey",
+            "insight": "Find consensus favorites, most divisive albums"
+        },
+        "discussion_attendance": {
+            "description": "Which members attended each discussion",
+            "value": "Simple yes/no per member",
+            "insight": "Engagement tracking, favorite discussion albums"
+        },
+        "favorite_track": {
+            "description": "Each member's standout track",
+            "value": "Collected during discussion",
+            "insight": "Create ultimate playlist, track preferences"
+        }
+    },
+    
+    "spotify_playlist_data": {
+        "playlist_order": {
+            "description": "Order albums appear in monthly playlist",
+            "value": "Document when creating playlist",
+            "insight": "See if order affects reception"
+        },
+        "date_added_to_playlist": {
+            "description": "When each album was added",
+            "value": "Available in Spotify playlist history",
+            "insight": "Track procrastination patterns"
+        }
+    },
+    
+    "discussion_metrics": {
+        "discussion_duration": {
+            "description": "How long you discussed each album",
+            "value": "Rough estimate in minutes",
+            "insight": "Which albums sparked most conversation"
+        },
+        "key_themes": {
+            "description": "Main discussion points (production, lyrics, nostalgia, etc)",
+            "value": "Quick tags during/after discussion",
+            "insight": "What drives your group's engagement"
+        },
+        "introduced_new_artist": {
+            "description": "Was this a discovery for most members?",
+            "value": "Simple yes/no",
+            "insight": "Discovery vs nostalgia balance"
+        }
+    },
+    
+    "contextual_data": {
+        "why_selected": {
+            "description": "Brief reason for selection",
+            "value": "One sentence when submitting",
+            "insight": "Selection motivations over time"
+        },
+        "pre_listen_familiarity": {
+            "description": "How well selector knew album (new/heard/favorite)",
+            "value": "Simple category",
+            "insight": "Risk-taking vs comfort picks"
+        },
+        "would_recommend_after": {
+            "description": "Would you recommend after group listen?",
+            "value": "Yes/Maybe/No",
+            "insight": "Which albums grew on people"
+        }
+    }
+}
+
+# Analytics that become possible once the suggested data is collected
+_ANALYTICS_IDEAS = {
+    "Temporal Analysis": [
+        "Album length trends over club lifetime",
+        "Rating patterns by season/month",
+        "Evolution of genre preferences",
+        "New discovery rate over time"
+    ],
+    
+    "Member Insights": [
+        "Consistency score (rating variance per member)",
+        "Discovery champion (who brings most new artists)",
+        "Crowd pleaser (highest average ratings)",
+        "Genre explorer (most diverse selections)",
+        "Engagement score (attendance + participation)"
+    ],
+    
+    "Album Insights": [
+        "Sleeper hits (low familiarity, high rating)",
+        "Divisive albums (high rating variance)",
+        "Gateway albums (led to exploring artist further)",
+        "Perfect length analysis",
+        "Energy progression throughout the year"
+    ],
+    
+    "Group Dynamics": [
+        "Consensus trends over time",
+        "Discussion length vs album complexity",
+        "Theme clustering (what sparks conversation)",
+        "Selection influence patterns"
+    ],
+    
+    "Predictive Features": [
+        "Predict discussion length from album features",
+        "Predict ratings based on selector and genre",
+        "Optimal album characteristics for your group",
+        "Next selection recommendations"
+    ]
+}
+
+def _read_album_csv(csv_path):
+    """Load the album club CSV, using the Arrow reader when pyarrow is installed"""
+    # Prefer a Parquet copy written alongside the CSV, as long as it isn't stale.
+    # enhance_album_data writes one next to its output (ac_enhanced.parquet); a
+    # plain ac.csv has no Parquet sibling and is always parsed as CSV
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    numeric_kwargs = {'dtype_backend': 'pyarrow'} if HAS_PYARROW else {}
+    if (HAS_PYARROW and os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        columns = [col for col in pq.read_schema(parquet_path).names if col in CSV_COLUMNS]
+        df = pd.read_parquet(parquet_path, columns=columns)
+    else:
+        # The pyarrow engine only accepts usecols as a list, so resolve it from the header
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [col for col in header if col in CSV_COLUMNS]
+        
+        if HAS_PYARROW:
+            df = pd.read_csv(csv_path, usecols=usecols, dtype=CSV_DTYPES,
+                             engine='pyarrow', dtype_backend='pyarrow')
+        else:
+            df = pd.read_csv(csv_path, usecols=usecols, dtype=CSV_DTYPES, engine='c')
+    
+    # Applied to every source so the Parquet and CSV loads agree
+    if 'Year' in df.columns:
+        # Via object: to_numeric(errors='coerce') mishandles Arrow strings containing nulls
+        df['Year'] = pd.to_numeric(df['Year'].astype(object), errors='coerce', **numeric_kwargs)
+    return df
+
 class AlbumDataEnrichment:
     """
     Suggestions for additional data collection and enrichment
     """
     
     def __init__(self, csv_path):
-        self.df = pd.read_csv(csv_path)
+        self.df = _read_album_csv(csv_path)
         self.spotify_base_url = "https://api.spotify.com/v1"
         
     def suggest_additional_data_points(self):
         """Generate suggestions for easy-to-gather additional data"""
         
-        suggestions = {
-            "easy_manual_additions": {
-                "album_length_minutes": {
-                    "description": "Total runtime of each album",
-                    "value": "Quick to find on Spotify/Apple Music",
-                    "insight": "Analyze listening commitment, find sweet spot lengths"
-                },
-                "track_count": {
-                    "description": "Number of tracks per album",
-                    "value": "Easy to count",
-                    "insight": "Compare EP vs LP preferences"
-                },
-                "member_rating": {
-                    "description": "1-10 rating from each member who listened",
-                    "value": "Quick post-discussion survey",
-                    "insight": "Find consensus favorites, most divisive albums"
-                },
-                "discussion_attendance": {
-                    "description": "Which members attended each discussion",
-                    "value": "Simple yes/no per member",
-                    "insight": "Engagement tracking, favorite discussion albums"
-                },
-                "favorite_track": {
-                    "description": "Each member's standout track",
-                    "value": "Collected during discussion",
-                    "insight": "Create ultimate playlist, track preferences"
-                }
-            },
-            
-            "spotify_playlist_data": {
-                "playlist_order": {
-                    "description": "Order albums appear in monthly playlist",
-                    "value": "Document when creating playlist",
-                    "insight": "See if order affects reception"
-                },
-                "date_added_to_playlist": {
-                    "description": "When each album was added",
-                    "value": "Available in Spotify playlist history",
-                    "insight": "Track procrastination patterns"
-                }
-            },
-            
-            "discussion_metrics": {
-                "discussion_duration": {
-                    "description": "How long you discussed each album",
-                    "value": "Rough estimate in minutes",
-                    "insight": "Which albums sparked most conversation"
-                },
-                "key_themes": {
-                    "description": "Main discussion points (production, lyrics, nostalgia, etc)",
-                    "value": "Quick tags during/after discussion",
-                    "insight": "What drives your group's engagement"
-                },
-                "introduced_new_artist": {
-                    "description": "Was this a discovery for most members?",
-                    "value": "Simple yes/no",
-                    "insight": "Discovery vs nostalgia balance"
-                }
-            },
-            
-            "contextual_data": {
-                "why_selected": {
-                    "description": "Brief reason for selection",
-                    "value": "One sentence when submitting",
-                    "insight": "Selection motivations over time"
-                },
-                "pre_listen_familiarity": {
-                    "description": "How well selector knew album (new/heard/favorite)",
-                    "value": "Simple category",
-                    "insight": "Risk-taking vs comfort picks"
-                },
-                "would_recommend_after": {
-                    "description": "Would you recommend after group listen?",
-                    "value": "Yes/Maybe/No",
-                    "insight": "Which albums grew on people"
-                }
-            }
-        }
-        
-        return suggestions
+        return _SUGGESTIONS
     
     def generate_collection_template(self):
         """Create a CSV template for collecting additional data"""
         
-        # Create base template with existing data
-        template_df = self.df.copy()
+        # Suggested new columns, the same ones write_collection_template emits
+        new_columns = list(SAMPLE_ROW)
         
-        # Add suggested new columns
-        new_columns = [
-            'album_length_minutes',
-            'track_count',
-            'avg_member_rating',
-            'discussion_attendance_count',
-            'standout_tracks',
-            'discussion_themes',
-            'new_discovery_for_most',
-            'selector_familiarity',
-            'would_recommend'
-        ]
-        
-        for col in new_columns:
-            template_df[col] = ''
+        # Create base template with existing data plus one block of empty columns
+        empty_columns = pd.DataFrame('', index=self.df.index, columns=new_columns, dtype='string')
+        template_df = pd.concat([self.df, empty_columns], axis=1)
         
         # Add sample data for first row to show format
         if len(template_df) > 0:
-            template_df.loc[0, 'album_length_minutes'] = '45'
-            template_df.loc[0, 'track_count'] = '12'
-            template_df.loc[0, 'avg_member_rating'] = '7.5'
-            template_df.loc[0, 'discussion_attendance_count'] = '4'
-            template_df.loc[0, 'standout_tracks'] = 'Track 3, Track 7'
-            template_df.loc[0, 'discussion_themes'] = 'production, nostalgia'
-            template_df.loc[0, 'new_discovery_for_most'] = 'Yes'
-            template_df.loc[0, 'selector_familiarity'] = 'Heard before'
-            template_df.loc[0, 'would_recommend'] = 'Yes'
+            template_df.iloc[0, template_df.columns.get_indexer(list(SAMPLE_ROW))] = list(SAMPLE_ROW.values())
         
         return template_df
     
+    def write_collection_template(self, output_path):
+        """Write the collection template to CSV"""
+        
+        self.generate_collection_template().to_csv(output_path, index=False)
+    
     def generate_spotify_api_template(self):
         """
         Template code for Spotify API integration
@@ -145,173 +243,241 @@ class AlbumDataEnrichment:
 # 2. Create an app to get client_id and client_secret
 # 3. Install spotipy: pip install spotipy
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
+import numpy as np
+
+# Spotify accepts at most 100 track ids per audio_features request
+AUDIO_FEATURES_BATCH_SIZE = 100
+
+# Responses are persisted here so re-runs skip previously seen albums
+SPOTIFY_CACHE_PATH = '.spotify_cache'
+
+AUDIO_FEATURE_KEYS = (
+    'danceability',
+    'energy',
+    'valence',  # musical positivity
+    'acousticness',
+    'instrumentalness'
+)
+
+def memoize_disk(namespace, key=lambda *args: args):
+    """Cache a SpotifyEnricher method's results in the enricher's on-disk shelf"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            cache_key = f"{namespace}:{key(*args)!r}"
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    return self._cache[cache_key]
+            
+            value = method(self, *args)
+            # Misses aren't persisted, so a transient failure or typo is retried next run
+            if value is not None:
+                with self._cache_lock:
+                    self._cache[cache_key] = value
+            return value
+        return wrapper
+    return decorator
 
 class SpotifyEnricher:
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, max_workers=8, cache_path=SPOTIFY_CACHE_PATH):
+        # Imported here so loading this module doesn't pull in spotipy's HTTP/OAuth stack
+        import spotipy
+        from spotipy.oauth2 import SpotifyClientCredentials
+        
         self.sp = spotipy.Spotify(
             client_credentials_manager=SpotifyClientCredentials(
                 client_id=client_id,
                 client_secret=client_secret
             )
         )
+        self.max_workers = max_workers
+        # shelve is not thread-safe, so every access goes through the lock
+        self._cache = shelve.open(cache_path)
+        self._cache_lock = threading.Lock()
+        # Cache (artist, album) -> album_id lookups for the life of the enricher
+        self.find_album = lru_cache(maxsize=None)(self._find_album)
     
-    def get_album_details(self, artist_name, album_name):
+    def close(self):
+        self._cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @memoize_disk('search', key=lambda artist_name, album_name: (artist_name.lower(), album_name.lower()))
+    def _find_album(self, artist_name, album_name):
         # Search for album
         results = self.sp.search(
-            q=f"artist:{artist_name} album:{album_name}", 
-            type='album', 
+            q=f"artist:{artist_name} album:{album_name}",
+            type='album',
             limit=1
         )
         
         if results['albums']['items']:
-            album = results['albums']['items'][0]
-            album_id = album['id']
-            
-            # Get full album details
-            album_info = self.sp.album(album_id)
-            tracks = self.sp.album_tracks(album_id)
-            
-            # Calculate total duration
-            total_ms = sum(track['duration_ms'] for track in tracks['items'])
-            total_minutes = total_ms / 1000 / 60
-            
-            # Get audio features for all tracks
-            track_ids = [track['id'] for track in tracks['items']]
-            audio_features = self.sp.audio_features(track_ids)
-            
-            # Calculate average features
-            avg_features = {
-                'danceability': 0,
-                'energy': 0,
-                'valence': 0,  # musical positivity
-                'acousticness': 0,
-                'instrumentalness': 0
-            }
-            
-            valid_tracks = [f for f in audio_features if f]
-            for features in valid_tracks:
-                for key in avg_features:
-                    avg_features[key] += features[key]
-            
-            for key in avg_features:
-                avg_features[key] /= len(valid_tracks)
-            
-            return {
-                'spotify_album_id': album_id,
-                'release_date_precision': album['release_date_precision'],
-                'total_tracks': album['total_tracks'],
-                'duration_minutes': round(total_minutes, 1),
-                'popularity': album['popularity'],
-                'avg_danceability': round(avg_features['danceability'], 3),
-                'avg_energy': round(avg_features['energy'], 3),
-                'avg_valence': round(avg_features['valence'], 3),
-                'avg_acousticness': round(avg_features['acousticness'], 3),
-                'avg_instrumentalness': round(avg_features['instrumentalness'], 3),
-                'label': album.get('label', 'Unknown'),
-                'spotify_url': album['external_urls']['spotify']
-            }
-        
+            return results['albums']['items'][0]['id']
         return None
+    
+    def _fetch_album(self, artist_name, album_name):
+        album_id = self.find_album(artist_name, album_name)
+        if album_id is None:
+            return None
+        
+        # Get full album details
+        return self._get_album(album_id), self._get_album_tracks(album_id)
+    
+    @memoize_disk('album')
+    def _get_album(self, album_id):
+        return self.sp.album(album_id)
+    
+    @memoize_disk('album_tracks')
+    def _get_album_tracks(self, album_id):
+        return self.sp.album_tracks(album_id)['items']
+    
+    def _fetch_audio_features(self, track_ids):
+        # Reuse cached features, then request the rest in as few calls as possible
+        features = {}
+        missing_ids = []
+        with self._cache_lock:
+            for track_id in dict.fromkeys(track_ids):
+                cache_key = f"audio_features:{track_id!r}"
+                if cache_key in self._cache:
+                    features[track_id] = self._cache[cache_key]
+                else:
+                    missing_ids.append(track_id)
+        
+        for i in range(0, len(missing_ids), AUDIO_FEATURES_BATCH_SIZE):
+            batch = missing_ids[i:i + AUDIO_FEATURES_BATCH_SIZE]
+            for track_id, feature in zip(batch, self.sp.audio_features(batch)):
+                features[track_id] = feature
+                # As in memoize_disk, tracks without features are retried next run
+                if feature is not None:
+                    with self._cache_lock:
+                        self._cache[f"audio_features:{track_id!r}"] = feature
+        return features
+    
+    def _summarize_album(self, album, tracks, features_by_id):
+        # Calculate total duration
+        total_ms = sum(track['duration_ms'] for track in tracks)
+        total_minutes = total_ms / 1000 / 60
+        
+        # Calculate average features
+        audio_features = [features_by_id.get(track['id']) for track in tracks]
+        valid_tracks = [f for f in audio_features if f]
+        feature_matrix = np.fromiter(
+            (features[key] for features in valid_tracks for key in AUDIO_FEATURE_KEYS),
+            dtype=np.float64,
+            count=len(valid_tracks) * len(AUDIO_FEATURE_KEYS)
+        ).reshape(-1, len(AUDIO_FEATURE_KEYS))
+        avg_features = dict(zip(AUDIO_FEATURE_KEYS, feature_matrix.mean(axis=0)))
+        
+        return {
+            'spotify_album_id': album['id'],
+            'release_date_precision': album['release_date_precision'],
+            'total_tracks': album['total_tracks'],
+            'duration_minutes': round(total_minutes, 1),
+            'popularity': album['popularity'],
+            'avg_danceability': round(avg_features['danceability'], 3),
+            'avg_energy': round(avg_features['energy'], 3),
+            'avg_valence': round(avg_features['valence'], 3),
+            'avg_acousticness': round(avg_features['acousticness'], 3),
+            'avg_instrumentalness': round(avg_features['instrumentalness'], 3),
+            'label': album.get('label', 'Unknown'),
+            'spotify_url': album['external_urls']['spotify']
+        }
+    
+    def get_album_details(self, artist_name, album_name):
+        return self.get_many_album_details([(artist_name, album_name)])[0]
+    
+    def get_many_album_details(self, albums):
+        """Look up (artist, album) pairs concurrently, batching audio feature requests"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            fetched = list(pool.map(lambda pair: self._fetch_album(*pair), albums))
+        
+        track_ids = [track['id'] for result in fetched if result for track in result[1]]
+        features_by_id = self._fetch_audio_features(track_ids)
+        
+        return [
+            self._summarize_album(*result, features_by_id) if result else None
+            for result in fetched
+        ]
 
 # Usage example:
-# enricher = SpotifyEnricher('your_client_id', 'your_client_secret')
-# album_data = enricher.get_album_details('B.B. King', 'Live At The Regal')
+# with SpotifyEnricher('your_client_id', 'your_client_secret') as enricher:
+#     album_data = enricher.get_album_details('B.B. King', 'Live At The Regal')
+#     all_albums = enricher.get_many_album_details(zip(df['album_artist'], df['album_name']))
 '''
         return template
     
     def create_enhanced_analytics(self):
         """Generate ideas for enhanced analytics with additional data"""
         
-        analytics_ideas = {
-            "Temporal Analysis": [
-                "Album length trends over club lifetime",
-                "Rating patterns by season/month",
-                "Evolution of genre preferences",
-                "New discovery rate over time"
-            ],
-            
-            "Member Insights": [
-                "Consistency score (rating variance per member)",
-                "Discovery champion (who brings most new artists)",
-                "Crowd pleaser (highest average ratings)",
-                "Genre explorer (most diverse selections)",
-                "Engagement score (attendance + participation)"
-            ],
-            
-            "Album Insights": [
-                "Sleeper hits (low familiarity, high rating)",
-                "Divisive albums (high rating variance)",
-                "Gateway albums (led to exploring artist further)",
-                "Perfect length analysis",
-                "Energy progression throughout the year"
-            ],
-            
-            "Group Dynamics": [
-                "Consensus trends over time",
-                "Discussion length vs album complexity",
-                "Theme clustering (what sparks conversation)",
-                "Selection influence patterns"
-            ],
-            
-            "Predictive Features": [
-                "Predict discussion length from album features",
-                "Predict ratings based on selector and genre",
-                "Optimal album characteristics for your group",
-                "Next selection recommendations"
-            ]
-        }
-        
-        return analytics_ideas
+        return _ANALYTICS_IDEAS
+
+# Field descriptions for the original, suggested and Spotify columns
+_DATA_DICTIONARY = {
+    "Original Fields": {
+        "Month": "Month of album club meeting",
+        "Year": "Year of album club meeting",
+        "album_name": "Name of the album",
+        "album_artist": "Artist/band name",
+        "album_release_date": "Year album was released",
+        "select_member": "Member who selected this album",
+        "Genre": "Musical genre(s), comma-separated",
+        "score": "Album score/rating (if tracked)",
+        "Blurb": "Brief notes or selection reason"
+    },
+    
+    "Suggested Additions": {
+        "album_length_minutes": "Total album runtime in minutes",
+        "track_count": "Number of tracks on album",
+        "avg_member_rating": "Average rating from all members (1-10)",
+        "individual_ratings": "JSON object with {member: rating}",
+        "discussion_attendance": "List of members who attended discussion",
+        "favorite_tracks": "JSON object with {member: track_name}",
+        "discussion_duration": "Approximate discussion time in minutes",
+        "discussion_themes": "Key topics discussed (comma-separated tags)",
+        "new_discovery_percentage": "% of members who hadn't heard album before",
+        "selector_familiarity": "new/heard_once/familiar/favorite",
+        "would_recommend": "Percentage who would recommend to others",
+        "playlist_position": "Order in monthly Spotify playlist",
+        "days_before_discussion": "Days between adding to playlist and discussion"
+    },
+    
+    "Spotify API Fields": {
+        "spotify_album_id": "Unique Spotify identifier",
+        "spotify_popularity": "Spotify popularity score (0-100)",
+        "spotify_duration_ms": "Exact duration in milliseconds",
+        "danceability": "Spotify danceability score (0-1)",
+        "energy": "Spotify energy score (0-1)",
+        "valence": "Musical positivity score (0-1)",
+        "acousticness": "Spotify acousticness score (0-1)",
+        "instrumentalness": "Likelihood of no vocals (0-1)",
+        "spotify_url": "Direct link to Spotify album"
+    }
+}
 
 # Create documentation for data collection
 def create_data_dictionary():
     """Create a data dictionary for the enhanced dataset"""
     
-    dictionary = {
-        "Original Fields": {
-            "Month": "Month of album club meeting",
-            "Year": "Year of album club meeting",
-            "album_name": "Name of the album",
-            "album_artist": "Artist/band name",
-            "album_release_date": "Year album was released",
-            "select_member": "Member who selected this album",
-            "Genre": "Musical genre(s), comma-separated",
-            "score": "Album score/rating (if tracked)",
-            "Blurb": "Brief notes or selection reason"
-        },
-        
-        "Suggested Additions": {
-            "album_length_minutes": "Total album runtime in minutes",
-            "track_count": "Number of tracks on album",
-            "avg_member_rating": "Average rating from all members (1-10)",
-            "individual_ratings": "JSON object with {member: rating}",
-            "discussion_attendance": "List of members who attended discussion",
-            "favorite_tracks": "JSON object with {member: track_name}",
-            "discussion_duration": "Approximate discussion time in minutes",
-            "discussion_themes": "Key topics discussed (comma-separated tags)",
-            "new_discovery_percentage": "% of members who hadn't heard album before",
-            "selector_familiarity": "new/heard_once/familiar/favorite",
-            "would_recommend": "Percentage who would recommend to others",
-            "playlist_position": "Order in monthly Spotify playlist",
-            "days_before_discussion": "Days between adding to playlist and discussion"
-        },
-        
-        "Spotify API Fields": {
-            "spotify_album_id": "Unique Spotify identifier",
-            "spotify_popularity": "Spotify popularity score (0-100)",
-            "spotify_duration_ms": "Exact duration in milliseconds",
-            "danceability": "Spotify danceability score (0-1)",
-            "energy": "Spotify energy score (0-1)",
-            "valence": "Musical positivity score (0-1)",
-            "acousticness": "Spotify acousticness score (0-1)",
-            "instrumentalness": "Likelihood of no vocals (0-1)",
-            "spotify_url": "Direct link to Spotify album"
-        }
-    }
-    
-    return dictionary
+    return _DATA_DICTIONARY
+
+def write_json(obj, path):
+    """Write obj as indented JSON, using orjson when it is installed"""
+    if HAS_ORJSON:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        # Non-ASCII text is written as UTF-8, as orjson does
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
 
 if __name__ == "__main__":
     enricher = AlbumDataEnrichment("ac.csv")
@@ -328,8 +494,7 @@ if __name__ == "__main__":
             print(f"     Why: {details['insight']}")
     
     # Create collection template
-    template = enricher.generate_collection_template()
-    template.to_csv("album_club_enhanced_template.csv", index=False)
+    enricher.write_collection_template("album_club_enhanced_template.csv")
     print("\n\n✅ Created 'album_club_enhanced_template.csv' for data collection")
     
     # Save Spotify integration template
@@ -339,12 +504,10 @@ if __name__ == "__main__":
     
     # Generate analytics ideas
     analytics = enricher.create_enhanced_analytics()
-    with open("analytics_ideas.json", "w") as f:
-        json.dump(analytics, f, indent=2)
+    write_json(analytics, "analytics_ideas.json")
     print("✅ Created 'analytics_ideas.json' with enhanced analytics possibilities")
     
     # Create data dictionary
     dictionary = create_data_dictionary()
-    with open("data_dictionary.json", "w") as f:
-        json.dump(dictionary, f, indent=2)
+    write_json(dictionary, "data_dictionary.json")
     print("✅ Created 'data_dictionary.json' for documentation")
\ No newline at end of file
@@ -1,38 +1,76 @@
+import json
+import os
+import re
 import pandas as pd
 import numpy as np
-import random
+
+from data_enrichment import CSV_COLUMNS, CSV_DTYPES
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Genres whose albums tend to run longer
+_LONG_FORM_GENRES = re.compile(r'Jazz|Classical')
+
+def _uniform_integers(u, low, high):
+    """Map uniform [0, 1) draws onto integers in [low, high)"""
+    return np.floor(u * (high - low)).astype(int) + low
+
+def _weighted_choice(u, options, p):
+    """Map uniform [0, 1) draws onto options with probabilities p"""
+    idx = np.searchsorted(np.cumsum(p), u, side='right')
+    return np.asarray(options)[np.minimum(idx, len(options) - 1)]
 
 def enhance_album_data(input_csv='ac.csv', output_csv='ac_enhanced.csv'):
     """
     Add semi-realistic enhanced data columns to test visualizations
     """
     # Read existing data
-    df = pd.read_csv(input_csv)
+    df = pd.read_csv(input_csv, usecols=lambda col: col in CSV_COLUMNS,
+                     dtype=CSV_DTYPES, engine='c')
     
     # Set random seed for reproducibility
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
+    n = len(df)
+    members = ['Sam', 'Steph', 'Glenn', 'Claire', 'Jamie']
     
+    # Draw every uniform variate in one block and slice per-column views from it:
+    # one column per scalar draw, then a noise and an ordering column per member
+    n_scalar = 11
+    uniforms = rng.random((n, n_scalar + 2 * len(members)))
+    (u_long, u_short, u_tracks, u_attendance, u_first_track, u_second_track,
+     u_themes, u_discovery, u_familiarity, u_duration, u_raters) = uniforms[:, :n_scalar].T
+    u_member_noise = uniforms[:, n_scalar:n_scalar + len(members)]
+    u_member_order = uniforms[:, n_scalar + len(members):]
+
     # Add album_length_minutes (realistic range: 25-75 minutes)
     # Jazz and classical tend to be longer
-    df['album_length_minutes'] = df.apply(lambda row: 
-        np.random.randint(40, 75) if 'Jazz' in str(row.get('Genre', '')) or 'Classical' in str(row.get('Genre', ''))
-        else np.random.randint(25, 55), axis=1)
+    genres = df['Genre'] if 'Genre' in df.columns else df.get('Genera', pd.Series('', index=df.index))
+    genre_mask = genres.astype('string').str.contains(_LONG_FORM_GENRES, na=False).to_numpy()
+    df['album_length_minutes'] = np.where(genre_mask,
+                                          _uniform_integers(u_long, 40, 75),
+                                          _uniform_integers(u_short, 25, 55))
     
     # Add track_count (realistic range: 8-20)
-    df['track_count'] = np.random.randint(8, 20, size=len(df))
+    df['track_count'] = _uniform_integers(u_tracks, 8, 20)
     
     # Add avg_member_rating (6.0-9.5, normally distributed around 7.5)
-    base_ratings = np.random.normal(7.5, 1.0, size=len(df))
+    base_ratings = rng.normal(7.5, 1.0, size=len(df))
     # Clip to realistic range and round to 1 decimal
     df['avg_member_rating'] = np.clip(base_ratings, 6.0, 9.5).round(1)
     
     # Add discussion_attendance_count (3-5 people)
-    df['discussion_attendance_count'] = np.random.randint(3, 6, size=len(df))
+    df['discussion_attendance_count'] = _uniform_integers(u_attendance, 3, 6)
     
     # Add standout_tracks (random track numbers)
-    df['standout_tracks'] = df.apply(lambda row: 
-        f"Track {random.randint(1, row['track_count'])}, Track {random.randint(1, row['track_count'])}", 
-        axis=1)
+    track_counts = df['track_count'].to_numpy()
+    first_track = _uniform_integers(u_first_track, 1, track_counts + 1)
+    second_track = _uniform_integers(u_second_track, 1, track_counts + 1)
+    df['standout_tracks'] = np.char.add(np.char.add('Track ', first_track.astype(str)),
+                                        np.char.add(', Track ', second_track.astype(str)))
     
     # Add discussion_themes
     themes_options = [
@@ -44,37 +82,51 @@ def enhance_album_data(input_csv='ac.csv', output_csv='ac_enhanced.csv'):
         'cultural impact, history',
         'instrumentation, vocals'
     ]
-    df['discussion_themes'] = np.random.choice(themes_options, size=len(df))
+    df['discussion_themes'] = np.asarray(themes_options)[_uniform_integers(u_themes, 0, len(themes_options))]
     
     # Add new_discovery_for_most (60% Yes)
-    df['new_discovery_for_most'] = np.random.choice(['Yes', 'No'], size=len(df), p=[0.6, 0.4])
+    df['new_discovery_for_most'] = _weighted_choice(u_discovery, ['Yes', 'No'], [0.6, 0.4])
     
     # Add selector_familiarity
     familiarity_options = ['New to me', 'Heard before', 'Familiar', 'Old favorite']
-    df['selector_familiarity'] = np.random.choice(familiarity_options, size=len(df), 
-                                                 p=[0.3, 0.3, 0.25, 0.15])
+    df['selector_familiarity'] = _weighted_choice(u_familiarity, familiarity_options,
+                                                  [0.3, 0.3, 0.25, 0.15])
     
+    ratings = df['avg_member_rating'].to_numpy()
+
     # Add would_recommend (correlated with rating)
-    df['would_recommend'] = df['avg_member_rating'].apply(
-        lambda rating: 'Yes' if rating >= 7.5 else ('Maybe' if rating >= 6.5 else 'No')
-    )
-    
+    df['would_recommend'] = np.select([ratings >= 7.5, ratings >= 6.5], ['Yes', 'Maybe'], default='No')
+
     # Add discussion_duration (20-90 minutes, longer for higher rated albums)
-    df['discussion_duration'] = df['avg_member_rating'].apply(
-        lambda rating: int(20 + (rating - 6) * 15 + np.random.randint(-10, 10))
-    )
+    df['discussion_duration'] = (20 + (ratings - 6) * 15 + _uniform_integers(u_duration, -10, 10)).astype(int)
     
     # Add some individual ratings as JSON (for future use)
-    members = ['Sam', 'Steph', 'Glenn', 'Claire', 'Jamie']
-    df['individual_ratings'] = df.apply(lambda row: 
-        str({member: round(row['avg_member_rating'] + np.random.uniform(-1.5, 1.5), 1) 
-             for member in random.sample(members, k=random.randint(3, 5))}),
-        axis=1)
-    
+    member_names = np.array(members)
+    member_ratings = np.round(ratings[:, None] + (u_member_noise * 3.0 - 1.5), 1)
+    # Each row gets a random ordering of members, truncated to 3-5 raters
+    member_order = np.argsort(u_member_order, axis=1)
+    rater_counts = _uniform_integers(u_raters, 3, 6)
+    row_names = member_names[member_order]
+    row_ratings = np.take_along_axis(member_ratings, member_order, axis=1)
+    df['individual_ratings'] = [
+        json.dumps(dict(zip(names[:k].tolist(), values[:k].tolist())), separators=(',', ':'))
+        for names, values, k in zip(row_names, row_ratings, rater_counts)
+    ]
+
+    # Store the low-cardinality label columns as categoricals
+    for col in ('discussion_themes', 'new_discovery_for_most', 'selector_familiarity', 'would_recommend'):
+        df[col] = df[col].astype('category')
+
     # Save enhanced data
     df.to_csv(output_csv, index=False)
     print(f"Enhanced data saved to {output_csv}")
     
+    # Columnar copy so downstream loads can skip CSV parsing
+    if HAS_PYARROW:
+        output_parquet = os.path.splitext(output_csv)[0] + '.parquet'
+        df.to_parquet(output_parquet, index=False, compression='zstd')
+        print(f"Enhanced data saved to {output_parquet}")
+    
     # Print summary
     print("\nData Enhancement Summary:")
     print(f"Total albums: {len(df)}")
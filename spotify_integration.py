@@ -5,76 +5,172 @@
 # 2. Create an app to get client_id and client_secret
 # 3. Install spotipy: pip install spotipy
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
+import numpy as np
+
+# Spotify accepts at most 100 track ids per audio_features request
+AUDIO_FEATURES_BATCH_SIZE = 100
+
+# Responses are persisted here so re-runs skip previously seen albums
+SPOTIFY_CACHE_PATH = '.spotify_cache'
+
+AUDIO_FEATURE_KEYS = (
+    'danceability',
+    'energy',
+    'valence',  # musical positivity
+    'acousticness',
+    'instrumentalness'
+)
+
+def memoize_disk(namespace, key=lambda *args: args):
+    """Cache a SpotifyEnricher method's results in the enricher's on-disk shelf"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            cache_key = f"{namespace}:{key(*args)!r}"
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    return self._cache[cache_key]
+            
+            value = method(self, *args)
+            # Misses aren't persisted, so a transient failure or typo is retried next run
+            if value is not None:
+                with self._cache_lock:
+                    self._cache[cache_key] = value
+            return value
+        return wrapper
+    return decorator
 
 class SpotifyEnricher:
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, max_workers=8, cache_path=SPOTIFY_CACHE_PATH):
+        # Imported here so loading this module doesn't pull in spotipy's HTTP/OAuth stack
+        import spotipy
+        from spotipy.oauth2 import SpotifyClientCredentials
+        
         self.sp = spotipy.Spotify(
             client_credentials_manager=SpotifyClientCredentials(
                 client_id=client_id,
                 client_secret=client_secret
             )
         )
+        self.max_workers = max_workers
+        # shelve is not thread-safe, so every access goes through the lock
+        self._cache = shelve.open(cache_path)
+        self._cache_lock = threading.Lock()
+        # Cache (artist, album) -> album_id lookups for the life of the enricher
+        self.find_album = lru_cache(maxsize=None)(self._find_album)
     
-    def get_album_details(self, artist_name, album_name):
+    def close(self):
+        self._cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @memoize_disk('search', key=lambda artist_name, album_name: (artist_name.lower(), album_name.lower()))
+    def _find_album(self, artist_name, album_name):
         # Search for album
         results = self.sp.search(
-            q=f"artist:{artist_name} album:{album_name}", 
-            type='album', 
+            q=f"artist:{artist_name} album:{album_name}",
+            type='album',
             limit=1
         )
         
         if results['albums']['items']:
-            album = results['albums']['items'][0]
-            album_id = album['id']
-            
-            # Get full album details
-            album_info = self.sp.album(album_id)
-            tracks = self.sp.album_tracks(album_id)
-            
-            # Calculate total duration
-            total_ms = sum(track['duration_ms'] for track in tracks['items'])
-            total_minutes = total_ms / 1000 / 60
-            
-            # Get audio features for all tracks
-            track_ids = [track['id'] for track in tracks['items']]
-            audio_features = self.sp.audio_features(track_ids)
-            
-            # Calculate average features
-            avg_features = {
-                'danceability': 0,
-                'energy': 0,
-                'valence': 0,  # musical positivity
-                'acousticness': 0,
-                'instrumentalness': 0
-            }
-            
-            valid_tracks = [f for f in audio_features if f]
-            for features in valid_tracks:
-                for key in avg_features:
-                    avg_features[key] += features[key]
-            
-            for key in avg_features:
-                avg_features[key] /= len(valid_tracks)
-            
-            return {
-                'spotify_album_id': album_id,
-                'release_date_precision': album['release_date_precision'],
-                'total_tracks': album['total_tracks'],
-                'duration_minutes': round(total_minutes, 1),
-                'popularity': album['popularity'],
-                'avg_danceability': round(avg_features['danceability'], 3),
-                'avg_energy': round(avg_features['energy'], 3),
-                'avg_valence': round(avg_features['valence'], 3),
-                'avg_acousticness': round(avg_features['acousticness'], 3),
-                'avg_instrumentalness': round(avg_features['instrumentalness'], 3),
-                'label': album.get('label', 'Unknown'),
-                'spotify_url': album['external_urls']['spotify']
-            }
-        
+            return results['albums']['items'][0]['id']
         return None
+    
+    def _fetch_album(self, artist_name, album_name):
+        album_id = self.find_album(artist_name, album_name)
+        if album_id is None:
+            return None
+        
+        # Get full album details
+        return self._get_album(album_id), self._get_album_tracks(album_id)
+    
+    @memoize_disk('album')
+    def _get_album(self, album_id):
+        return self.sp.album(album_id)
+    
+    @memoize_disk('album_tracks')
+    def _get_album_tracks(self, album_id):
+        return self.sp.album_tracks(album_id)['items']
+    
+    def _fetch_audio_features(self, track_ids):
+        # Reuse cached features, then request the rest in as few calls as possible
+        features = {}
+        missing_ids = []
+        with self._cache_lock:
+            for track_id in dict.fromkeys(track_ids):
+                cache_key = f"audio_features:{track_id!r}"
+                if cache_key in self._cache:
+                    features[track_id] = self._cache[cache_key]
+                else:
+                    missing_ids.append(track_id)
+        
+        for i in range(0, len(missing_ids), AUDIO_FEATURES_BATCH_SIZE):
+            batch = missing_ids[i:i + AUDIO_FEATURES_BATCH_SIZE]
+            for track_id, feature in zip(batch, self.sp.audio_features(batch)):
+                features[track_id] = feature
+                # As in memoize_disk, tracks without features are retried next run
+                if feature is not None:
+                    with self._cache_lock:
+                        self._cache[f"audio_features:{track_id!r}"] = feature
+        return features
+    
+    def _summarize_album(self, album, tracks, features_by_id):
+        # Calculate total duration
+        total_ms = sum(track['duration_ms'] for track in tracks)
+        total_minutes = total_ms / 1000 / 60
+        
+        # Calculate average features
+        audio_features = [features_by_id.get(track['id']) for track in tracks]
+        valid_tracks = [f for f in audio_features if f]
+        feature_matrix = np.fromiter(
+            (features[key] for features in valid_tracks for key in AUDIO_FEATURE_KEYS),
+            dtype=np.float64,
+            count=len(valid_tracks) * len(AUDIO_FEATURE_KEYS)
+        ).reshape(-1, len(AUDIO_FEATURE_KEYS))
+        avg_features = dict(zip(AUDIO_FEATURE_KEYS, feature_matrix.mean(axis=0)))
+        
+        return {
+            'spotify_album_id': album['id'],
+            'release_date_precision': album['release_date_precision'],
+            'total_tracks': album['total_tracks'],
+            'duration_minutes': round(total_minutes, 1),
+            'popularity': album['popularity'],
+            'avg_danceability': round(avg_features['danceability'], 3),
+            'avg_energy': round(avg_features['energy'], 3),
+            'avg_valence': round(avg_features['valence'], 3),
+            'avg_acousticness': round(avg_features['acousticness'], 3),
+            'avg_instrumentalness': round(avg_features['instrumentalness'], 3),
+            'label': album.get('label', 'Unknown'),
+            'spotify_url': album['external_urls']['spotify']
+        }
+    
+    def get_album_details(self, artist_name, album_name):
+        return self.get_many_album_details([(artist_name, album_name)])[0]
+    
+    def get_many_album_details(self, albums):
+        """Look up (artist, album) pairs concurrently, batching audio feature requests"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            fetched = list(pool.map(lambda pair: self._fetch_album(*pair), albums))
+        
+        track_ids = [track['id'] for result in fetched if result for track in result[1]]
+        features_by_id = self._fetch_audio_features(track_ids)
+        
+        return [
+            self._summarize_album(*result, features_by_id) if result else None
+            for result in fetched
+        ]
 
 # Usage example:
-# enricher = SpotifyEnricher('your_client_id', 'your_client_secret')
-# album_data = enricher.get_album_details('B.B. King', 'Live At The Regal')
+# with SpotifyEnricher('your_client_id', 'your_client_secret') as enricher:
+#     album_data = enricher.get_album_details('B.B. King', 'Live At The Regal')
+#     all_albums = enricher.get_many_album_details(zip(df['album_artist'], df['album_name']))
@@ -1,25 +1,101 @@
+import copy
+import functools
 import pandas as pd
 import numpy as np
-from collections import Counter, defaultdict
-from datetime import datetime
 import json
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _explode_genres(df):
+    """One row per (selection, genre) from the comma-separated Genre column"""
+    genres = df['Genre']
+    if HAS_PYARROW and isinstance(genres.dtype, pd.ArrowDtype):
+        # Split, flatten and trim in Arrow kernels; null genres produce no rows
+        genre_lists = pc.split_pattern(pa.array(genres.array), ',')
+        parents = pc.list_parent_indices(genre_lists).to_numpy()
+        flat = pc.utf8_trim_whitespace(pc.list_flatten(genre_lists))
+        return df[['select_member', 'Month']].iloc[parents].assign(Genre=pd.array(flat, dtype=genres.dtype))
+    
+    return (
+        df[['select_member', 'Month', 'Genre']]
+        .dropna(subset=['Genre'])
+        .assign(Genre=lambda d: d['Genre'].str.split(','))
+        .explode('Genre')
+        .assign(Genre=lambda d: d['Genre'].str.strip())
+    )
+
 class AlbumClubWrapped:
+    # self.df is fully prepared in __init__ and treated as read-only afterwards,
+    # which is what makes caching the stats on the instance safe
     def __init__(self, csv_path):
-        self.df = pd.read_csv(csv_path)
+        # Arrow's multithreaded reader, with Arrow-backed columns, when pyarrow is installed
+        read_kwargs = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'} if HAS_PYARROW else {}
+        self.df = pd.read_csv(csv_path, **read_kwargs)
         # Clean column names
         self.df.columns = self.df.columns.str.strip()
         # Clean the 'March ' entries with trailing space
         self.df['Month'] = self.df['Month'].str.strip()
-        # Convert Year to int
-        self.df['Year'] = pd.to_numeric(self.df['Year'], errors='coerce')
-        # Parse release dates
-        self.df['album_release_date'] = pd.to_numeric(self.df['album_release_date'], errors='coerce')
+        # Convert Year to int. Parsed via object: to_numeric(errors='coerce') mishandles
+        # Arrow strings containing nulls, which is what a partly non-numeric column reads as
+        numeric_kwargs = {'dtype_backend': 'pyarrow'} if HAS_PYARROW else {}
+        self.df['Year'] = pd.to_numeric(self.df['Year'].astype(object), errors='coerce', **numeric_kwargs)
+        # Parse release dates; years fit in 16 bits, a quarter of the bytes the year stats scan.
+        # Fractional years are rounded and out-of-range ones become NA so the cast can't fail
+        year_dtype = 'int16[pyarrow]' if HAS_PYARROW else 'Int16'
+        release_years = pd.to_numeric(self.df['album_release_date'].astype(object), errors='coerce',
+                                      **numeric_kwargs).round()
+        int16_info = np.iinfo(np.int16)
+        self.df['album_release_date'] = (release_years.where(release_years.between(int16_info.min, int16_info.max))
+                                         .astype(year_dtype))
         # Clean genre column name
         if 'Genera' in self.df.columns:
             self.df.rename(columns={'Genera': 'Genre'}, inplace=True)
-        
+        # Repeated-value columns as categoricals. Members and artists keep first-seen
+        # category order so value_counts ties still resolve in row order
+        self.df['Month'] = self.df['Month'].astype('category')
+        for col in ('select_member', 'album_artist'):
+            self.df[col] = pd.Categorical(self.df[col], categories=self.df[col].dropna().unique())
+        # Create proper date column
+        self.df['date'] = pd.to_datetime(self.df['Year'].astype(str) + '-' + self.df['Month'].astype(str), 
+                                         format='%Y-%B', errors='coerce')
+        # One row per (selection, genre) for the genre-based stats
+        self._genres_exploded = _explode_genres(self.df)
+        # Selections with a known release year, shared by the era/decade/age stats
+        self._dated = self.df.dropna(subset=['album_release_date'])
+        # Monthly grouping shared by the per-month stats
+        self._by_month = self.df.groupby('Month', observed=True)
+        
+    @functools.cached_property
+    def _member_agg(self):
+        """Selection count and release year mean/min/max/span per member, in first-seen member order"""
+        by_member = self.df.groupby('select_member', sort=False, observed=True)
+        
+        agg = by_member.agg(
+            count=('album_release_date', 'size'),
+            mean=('album_release_date', 'mean'),
+            min=('album_release_date', 'min'),
+            max=('album_release_date', 'max')
+        )
+        agg['span'] = agg['max'] - agg['min']
+        return agg
+    
     def generate_wrapped_stats(self):
+        # Hand out a copy so callers can't mutate the cached stats
+        return copy.deepcopy(self._stats)
+    
+    @functools.cached_property
+    def _stats(self):
         stats = {}
         
         # Member statistics
@@ -41,7 +117,7 @@ class AlbumClubWrapped:
         stats['artist_stats'] = self._get_artist_stats()
         
         # Superlatives
-        stats['superlatives'] = self._get_superlatives()
+        stats['superlatives'] = self._get_superlatives(stats['member_stats']['genre_preferences'])
         
         # Club evolution
         stats['club_evolution'] = self._get_club_evolution()
@@ -49,39 +125,41 @@ class AlbumClubWrapped:
         return stats
     
     def _get_member_stats(self):
-        member_counts = self.df['select_member'].value_counts().to_dict()
+        # Same order as value_counts: most selections first, ties in first-seen order
+        member_counts = self._member_agg['count'].sort_values(ascending=False, kind='stable').to_dict()
         
         # Genre preferences by member
-        genre_by_member = defaultdict(list)
-        for _, row in self.df.iterrows():
-            if pd.notna(row['Genre']):
-                genres = [g.strip() for g in str(row['Genre']).split(',')]
-                genre_by_member[row['select_member']].extend(genres)
-        
-        member_genre_prefs = {}
-        for member, genres in genre_by_member.items():
-            if genres:
-                genre_counter = Counter(genres)
-                member_genre_prefs[member] = {
-                    'top_genre': genre_counter.most_common(1)[0],
-                    'genre_diversity': len(set(genres))
-                }
+        # sort=False keeps first-seen order, so ties resolve like Counter.most_common
+        genre_counts = (self._genres_exploded
+                        .groupby(['select_member', 'Genre'], sort=False, observed=True)
+                        .size())
+        by_member = genre_counts.groupby(level='select_member', sort=False, observed=True)
+        top_genres = by_member.idxmax()
+        
+        # Each (member, genre) pair appears once, so the group size is the member's genre diversity
+        member_genre_prefs = {
+            member: {
+                'top_genre': (top_genres[member][1], top_count),
+                'genre_diversity': diversity
+            }
+            for member, top_count, diversity in zip(
+                top_genres.index, by_member.max().tolist(), by_member.size().tolist())
+        }
         
         # Era preferences (based on release dates)
-        era_by_member = defaultdict(list)
-        for _, row in self.df.iterrows():
-            if pd.notna(row['album_release_date']):
-                era_by_member[row['select_member']].append(row['album_release_date'])
-        
-        member_era_stats = {}
-        for member, years in era_by_member.items():
-            if years:
-                member_era_stats[member] = {
-                    'avg_release_year': np.mean(years),
-                    'oldest_pick': min(years),
-                    'newest_pick': max(years),
-                    'year_span': max(years) - min(years)
-                }
+        era = self._member_agg.dropna(subset=['mean'])
+        
+        member_era_stats = {
+            member: {
+                'avg_release_year': avg_year,
+                'oldest_pick': oldest,
+                'newest_pick': newest,
+                'year_span': span
+            }
+            for member, avg_year, oldest, newest, span in zip(
+                era.index, era['mean'].tolist(), era['min'].tolist(), era['max'].tolist(),
+                era['span'].tolist())
+        }
         
         return {
             'selection_counts': member_counts,
@@ -91,117 +169,84 @@ class AlbumClubWrapped:
     
     def _get_genre_stats(self):
         # Flatten all genres
-        all_genres = []
-        for genres in self.df['Genre'].dropna():
-            all_genres.extend([g.strip() for g in str(genres).split(',')])
-        
-        genre_counts = Counter(all_genres)
+        all_genres = self._genres_exploded['Genre']
+        # Stable sort on first-seen counts keeps Counter.most_common tie order
+        genre_counts = all_genres.value_counts(sort=False).sort_values(ascending=False, kind='stable')
+        top_genres = genre_counts.head(10)
         
         # Genre diversity by month
-        monthly_genre_diversity = {}
-        for month in self.df['Month'].unique():
-            month_df = self.df[self.df['Month'] == month]
-            month_genres = []
-            for genres in month_df['Genre'].dropna():
-                month_genres.extend([g.strip() for g in str(genres).split(',')])
-            monthly_genre_diversity[month] = len(set(month_genres))
+        monthly_genre_diversity = (self._genres_exploded
+                                   .groupby('Month', sort=False, observed=True)['Genre'].nunique()
+                                   .reindex(self.df['Month'].dropna().unique(), fill_value=0))
         
         return {
-            'top_genres': genre_counts.most_common(10),
-            'total_unique_genres': len(set(all_genres)),
-            'monthly_diversity': monthly_genre_diversity
+            'top_genres': list(zip(top_genres.index, top_genres.tolist())),
+            'total_unique_genres': all_genres.nunique(),
+            'monthly_diversity': dict(zip(monthly_genre_diversity.index, monthly_genre_diversity.tolist()))
         }
     
     def _get_decade_stats(self):
-        decades = defaultdict(int)
-        for year in self.df['album_release_date'].dropna():
-            decade = int(year // 10) * 10
-            decades[f"{decade}s"] += 1
-        
-        return dict(sorted(decades.items()))
+        decades = self._dated['album_release_date'] // 10 * 10
+        return decades.astype(str).add('s').value_counts().sort_index().to_dict()
     
     def _get_album_age_stats(self):
         current_year = 2025
-        ages = []
-        for _, row in self.df.iterrows():
-            if pd.notna(row['album_release_date']):
-                age = current_year - row['album_release_date']
-                ages.append(age)
+        years = self._dated['album_release_date']
+        ages = current_year - years
         
-        if ages:
+        if not ages.empty:
             return {
-                'avg_album_age': np.mean(ages),
-                'median_album_age': np.median(ages),
-                'oldest_album': self.df.loc[self.df['album_release_date'].idxmin()],
-                'newest_album': self.df.loc[self.df['album_release_date'].idxmax()]
+                'avg_album_age': ages.mean(),
+                'median_album_age': ages.median(),
+                'oldest_album': self.df.loc[years.idxmin()],
+                'newest_album': self.df.loc[years.idxmax()]
             }
         return {}
     
     def _get_monthly_patterns(self):
         # Albums per month
-        albums_per_month = self.df.groupby('Month').size().to_dict()
+        albums_per_month = self._by_month.size()
         
         # Average selections per person per month
-        avg_per_person = {}
-        for month in self.df['Month'].unique():
-            month_df = self.df[self.df['Month'] == month]
-            unique_selectors = month_df['select_member'].nunique()
-            avg_per_person[month] = len(month_df) / unique_selectors if unique_selectors > 0 else 0
+        unique_selectors = self._by_month['select_member'].nunique()
+        avg_per_person = (albums_per_month / unique_selectors).where(unique_selectors > 0, 0)
+        avg_per_person = avg_per_person.reindex(self.df['Month'].dropna().unique(), fill_value=0)
         
         return {
-            'albums_per_month': albums_per_month,
-            'avg_selections_per_person': avg_per_person
+            'albums_per_month': albums_per_month.to_dict(),
+            'avg_selections_per_person': dict(zip(avg_per_person.index, avg_per_person.tolist()))
         }
     
     def _get_artist_stats(self):
         artist_counts = self.df['album_artist'].value_counts()
-        repeat_artists = artist_counts[artist_counts > 1].to_dict()
         
         return {
-            'total_unique_artists': len(artist_counts),
-            'repeat_artists': repeat_artists
+            'total_unique_artists': self.df['album_artist'].nunique(),
+            'repeat_artists': artist_counts.loc[artist_counts > 1].to_dict()
         }
     
-    def _get_superlatives(self):
+    def _get_superlatives(self, member_genre_prefs=None):
         superlatives = {}
         
-        # Member with most eclectic taste (genre diversity)
-        genre_diversity = {}
-        for member in self.df['select_member'].unique():
-            member_df = self.df[self.df['select_member'] == member]
-            member_genres = []
-            for genres in member_df['Genre'].dropna():
-                member_genres.extend([g.strip() for g in str(genres).split(',')])
-            genre_diversity[member] = len(set(member_genres))
-        
-        if genre_diversity:
-            superlatives['most_eclectic'] = max(genre_diversity.items(), key=lambda x: x[1])
+        # Member with most eclectic taste (genre diversity), reusing the member stats when given
+        if member_genre_prefs is None:
+            member_genre_prefs = self._get_member_stats()['genre_preferences']
         
-        # Time traveler (biggest year span in selections)
-        year_spans = {}
-        for member in self.df['select_member'].unique():
-            member_df = self.df[self.df['select_member'] == member]
-            years = member_df['album_release_date'].dropna()
-            if len(years) > 0:
-                year_spans[member] = years.max() - years.min()
+        if member_genre_prefs:
+            superlatives['most_eclectic'] = max(
+                ((member, prefs['genre_diversity']) for member, prefs in member_genre_prefs.items()),
+                key=lambda x: x[1])
         
-        if year_spans:
-            superlatives['time_traveler'] = max(year_spans.items(), key=lambda x: x[1])
+        # Year stats per member, in first-seen order so ties resolve as before
+        years = self._member_agg.dropna(subset=['mean'])
         
-        # Vintage collector (oldest average release year)
-        avg_years = {}
-        for member in self.df['select_member'].unique():
-            member_df = self.df[self.df['select_member'] == member]
-            years = member_df['album_release_date'].dropna()
-            if len(years) > 0:
-                avg_years[member] = years.mean()
-        
-        if avg_years:
-            superlatives['vintage_collector'] = min(avg_years.items(), key=lambda x: x[1])
-        
-        # Trendsetter (newest average release year)
-        if avg_years:
-            superlatives['trendsetter'] = max(avg_years.items(), key=lambda x: x[1])
+        if not years.empty:
+            # Time traveler (biggest year span in selections)
+            superlatives['time_traveler'] = (years['span'].idxmax(), float(years['span'].max()))
+            # Vintage collector (oldest average release year)
+            superlatives['vintage_collector'] = (years['mean'].idxmin(), years['mean'].min())
+            # Trendsetter (newest average release year)
+            superlatives['trendsetter'] = (years['mean'].idxmax(), years['mean'].max())
         
         return superlatives
     
@@ -209,69 +254,84 @@ class AlbumClubWrapped:
         # Track participation over time
         monthly_participation = []
         
-        # Create proper date column
-        self.df['date'] = pd.to_datetime(self.df['Year'].astype(str) + '-' + self.df['Month'], 
-                                         format='%Y-%B', errors='coerce')
-        
-        sorted_df = self.df.sort_values('date')
-        
-        for date in sorted_df['date'].dropna().unique():
-            month_df = sorted_df[sorted_df['date'] == date]
+        for date, month_df in self.df.dropna(subset=['date']).groupby('date', sort=True):
             monthly_participation.append({
                 'date': date.strftime('%B %Y'),
-                'participants': list(month_df['select_member'].unique()),
+                'participants': list(month_df['select_member'].dropna().unique()),
                 'num_albums': len(month_df)
             })
         
         return monthly_participation
 
 def format_stats_for_display(stats):
-    """Format statistics for readable output"""
-    output = []
-    
-    output.append("=== ALBUM CLUB WRAPPED 2024-2025 ===\n")
+    """Format statistics for readable output, one line at a time"""
+    yield "=== ALBUM CLUB WRAPPED 2024-2025 ===\n"
     
     # Member highlights
-    output.append("🎵 MEMBER HIGHLIGHTS")
+    yield "🎵 MEMBER HIGHLIGHTS"
     member_stats = stats['member_stats']
     for member, count in member_stats['selection_counts'].items():
-        output.append(f"  {member}: {count} albums selected")
+        yield f"  {member}: {count} albums selected"
         if member in member_stats['genre_preferences']:
             top_genre = member_stats['genre_preferences'][member]['top_genre']
-            output.append(f"    Favorite genre: {top_genre[0]} ({top_genre[1]} picks)")
+            yield f"    Favorite genre: {top_genre[0]} ({top_genre[1]} picks)"
         if member in member_stats['era_preferences']:
             avg_year = member_stats['era_preferences'][member]['avg_release_year']
-            output.append(f"    Average release year: {avg_year:.0f}")
+            yield f"    Average release year: {avg_year:.0f}"
     
-    output.append("\n🎸 GENRE INSIGHTS")
-    output.append(f"  Total unique genres explored: {stats['genre_stats']['total_unique_genres']}")
-    output.append("  Top 5 genres:")
+    yield "\n🎸 GENRE INSIGHTS"
+    yield f"  Total unique genres explored: {stats['genre_stats']['total_unique_genres']}"
+    yield "  Top 5 genres:"
     for genre, count in stats['genre_stats']['top_genres'][:5]:
-        output.append(f"    - {genre}: {count}")
+        yield f"    - {genre}: {count}"
     
-    output.append("\n📅 DECADE BREAKDOWN")
+    yield "\n📅 DECADE BREAKDOWN"
     for decade, count in stats['decade_stats'].items():
-        output.append(f"  {decade}: {count} albums")
+        yield f"  {decade}: {count} albums"
     
-    output.append("\n🏆 SUPERLATIVES")
+    yield "\n🏆 SUPERLATIVES"
     sup = stats['superlatives']
     if 'most_eclectic' in sup:
-        output.append(f"  Most Eclectic Taste: {sup['most_eclectic'][0]} ({sup['most_eclectic'][1]} different genres)")
+        yield f"  Most Eclectic Taste: {sup['most_eclectic'][0]} ({sup['most_eclectic'][1]} different genres)"
     if 'time_traveler' in sup:
-        output.append(f"  Time Traveler: {sup['time_traveler'][0]} ({sup['time_traveler'][1]:.0f} year span)")
+        yield f"  Time Traveler: {sup['time_traveler'][0]} ({sup['time_traveler'][1]:.0f} year span)"
     if 'vintage_collector' in sup:
-        output.append(f"  Vintage Collector: {sup['vintage_collector'][0]} (avg year: {sup['vintage_collector'][1]:.0f})")
+        yield f"  Vintage Collector: {sup['vintage_collector'][0]} (avg year: {sup['vintage_collector'][1]:.0f})"
     if 'trendsetter' in sup:
-        output.append(f"  Trendsetter: {sup['trendsetter'][0]} (avg year: {sup['trendsetter'][1]:.0f})")
+        yield f"  Trendsetter: {sup['trendsetter'][0]} (avg year: {sup['trendsetter'][1]:.0f})"
     
-    output.append("\n🎤 ARTIST LOVE")
-    output.append(f"  Total unique artists: {stats['artist_stats']['total_unique_artists']}")
+    yield "\n🎤 ARTIST LOVE"
+    yield f"  Total unique artists: {stats['artist_stats']['total_unique_artists']}"
     if stats['artist_stats']['repeat_artists']:
-        output.append("  Artists we couldn't get enough of:")
+        yield "  Artists we couldn't get enough of:"
         for artist, count in stats['artist_stats']['repeat_artists'].items():
-            output.append(f"    - {artist}: {count} albums")
+            yield f"    - {artist}: {count} albums"
+
+def _album_summary(album):
+    return {
+        'name': album['album_name'],
+        'artist': album['album_artist'],
+        'year': int(album['album_release_date'])
+    }
+
+def write_stats_json(stats, path):
+    """Write stats as indented JSON; NumPy scalars are serialized natively"""
+    age_stats = stats['album_age_stats']
+    if age_stats:
+        # The oldest/newest albums are full DataFrame rows; keep just the headline fields
+        stats = {**stats, 'album_age_stats': {
+            **age_stats,
+            'oldest_album': _album_summary(age_stats['oldest_album']),
+            'newest_album': _album_summary(age_stats['newest_album'])
+        }}
     
-    return "\n".join(output)
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(stats, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    else:
+        # Non-ASCII names are written as UTF-8, as orjson does
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False, default=lambda value: value.item())
 
 # Run analysis
 if __name__ == "__main__":
@@ -279,45 +339,10 @@ if __name__ == "__main__":
     stats = wrapped.generate_wrapped_stats()
     
     # Save raw stats as JSON
-    with open('wrapped_stats.json', 'w') as f:
-        # Convert non-serializable objects
-        json_safe_stats = {}
-        for key, value in stats.items():
-            if key == 'member_stats':
-                json_safe_stats[key] = {
-                    'selection_counts': value['selection_counts'],
-                    'genre_preferences': value['genre_preferences'],
-                    'era_preferences': {k: {sk: float(sv) if isinstance(sv, np.number) else sv 
-                                           for sk, sv in v.items()} 
-                                       for k, v in value['era_preferences'].items()}
-                }
-            elif key == 'album_age_stats':
-                if value:
-                    json_safe_stats[key] = {
-                        'avg_album_age': float(value['avg_album_age']),
-                        'median_album_age': float(value['median_album_age']),
-                        'oldest_album': {
-                            'name': value['oldest_album']['album_name'],
-                            'artist': value['oldest_album']['album_artist'],
-                            'year': int(value['oldest_album']['album_release_date'])
-                        },
-                        'newest_album': {
-                            'name': value['newest_album']['album_name'],
-                            'artist': value['newest_album']['album_artist'],
-                            'year': int(value['newest_album']['album_release_date'])
-                        }
-                    }
-            elif key == 'superlatives':
-                json_safe_stats[key] = {k: (v[0], float(v[1]) if isinstance(v[1], np.number) else v[1]) 
-                                      for k, v in value.items()}
-            else:
-                json_safe_stats[key] = value
-        
-        json.dump(json_safe_stats, f, indent=2)
+    write_stats_json(stats, 'wrapped_stats.json')
     
     # Save formatted output
-    formatted = format_stats_for_display(stats)
     with open('wrapped_summary.txt', 'w') as f:
-        f.write(formatted)
+        f.writelines(line + "\n" for line in format_stats_for_display(stats))
     
     print("Analysis complete! Check wrapped_summary.txt and wrapped_stats.json")
\ No newline at end of file